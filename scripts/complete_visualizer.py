@@ -9,7 +9,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.gridspec import GridSpec
-from scipy.fft import fft, fftfreq
+from scipy.fft import rfft, rfftfreq
 import queue
 import time
 from collections import deque
@@ -19,16 +19,33 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
+from viz_common import RENDER_PARAMS, VisualizerHelpers
+
+# Packed per-sample record used for CSV playback; labels are stored as codes
+COMMANDS = ('NONE', 'FOCUS', 'RELAX', 'BLINK')
+PREDICTION_LABELS = ('NORMAL', 'BORDERLINE', 'IMPAIRED')
+SAMPLE_DTYPE = np.dtype([('time', 'f4'), ('amp', 'f4'),
+                         ('theta', 'f4'), ('alpha', 'f4'), ('beta', 'f4'), ('gamma', 'f4'),
+                         ('led', 'u1'), ('v', 'u1'), ('m', 'u1'), ('a', 'u1'), ('cmd', 'u1')])
+
+# Instruction classes tracked by RISCVSimulator.instruction_breakdown
+INSTRUCTION_TYPES = ('ALU', 'Mem', 'Branch', 'FPU', 'Custom')
+IDX_ALU, IDX_MEM, IDX_BRANCH, IDX_FPU, IDX_CUSTOM = range(len(INSTRUCTION_TYPES))
+
 class RISCVSimulator:
     def __init__(self):
         self.reset()
         self.c_baseline_cycles = 0
         self.asm_optimized_cycles = 0
+        # Pre-drawn correlation factors, consumed round-robin (size is a power of two)
+        self._rng = np.random.default_rng()
+        self._noise = self._rng.uniform(-1, 1, 4096).astype(np.float32)
+        self._noise_idx = 0
         
     def reset(self):
         self.total_instructions = 0
         self.total_cycles = 0
-        self.instruction_breakdown = {'ALU': 0, 'Mem': 0, 'Branch': 0, 'FPU': 0, 'Custom': 0}
+        self.instruction_breakdown = np.zeros(len(INSTRUCTION_TYPES), dtype=np.int64)
         self.cache_hits = 0
         self.cache_misses = 0
         self.pipeline_stalls = 0
@@ -43,17 +60,20 @@ class RISCVSimulator:
         self.c_baseline_cycles = butterflies * 20
         self.asm_optimized_cycles = butterflies * 8
         
-        self.instruction_breakdown['ALU'] += butterflies * 2
-        self.instruction_breakdown['Mem'] += butterflies
-        self.instruction_breakdown['FPU'] += butterflies * 2
-        self.instruction_breakdown['Custom'] += butterflies
-        self.instruction_breakdown['Branch'] += log_n * 2
+        delta = np.empty(len(INSTRUCTION_TYPES), dtype=np.int64)
+        delta[IDX_ALU] = butterflies * 2
+        delta[IDX_MEM] = butterflies
+        delta[IDX_BRANCH] = log_n * 2
+        delta[IDX_FPU] = butterflies * 2
+        delta[IDX_CUSTOM] = butterflies
+        self.instruction_breakdown += delta
         
         self.total_instructions += butterflies * 6 + log_n * 2
         self.total_cycles += self.asm_optimized_cycles
         
         # Shared correlation factor (-1.0 to 1.0) to make metrics move in sync
-        correlation_factor = np.random.uniform(-1, 1)
+        correlation_factor = float(self._noise[self._noise_idx])
+        self._noise_idx = (self._noise_idx + 1) & 4095
         
         # Dynamic Cache Simulation (80-85% range)
         cache_hit_rate = 0.825 + (correlation_factor * 0.025)
@@ -86,17 +106,29 @@ class RISCVSimulator:
         return self.branch_predictions / max(1, total) * 100
 
 
-class CompleteBCIVisualizer:
+class CompleteBCIVisualizer(VisualizerHelpers):
     def __init__(self, dataset_path=None, dataset_type="General"):
         self.sampling_rate = 256
         self.window_size = 256
         self.display_seconds = 3
         self.update_interval = 50
         self.dataset_type = dataset_type
+        # Set by the caller once FuncAnimation exists; used for adaptive pacing
+        self.anim = None
+        self._ema_frame_ms = 0.0
+        # Code -> label for each packed label field; load_and_visualize adds a file's unknown labels
+        self.labels = {'cmd': COMMANDS, 'v': PREDICTION_LABELS, 'm': PREDICTION_LABELS, 'a': PREDICTION_LABELS}
         
         self.max_points = int(self.sampling_rate * self.display_seconds)
-        self.time_data = deque(maxlen=self.max_points)
-        self.signal_data = deque(maxlen=self.max_points)
+        # Ring buffers: _head is the next write slot, _filled the valid count
+        self._t_buf = np.zeros(self.max_points, dtype=np.float32)
+        self._y_buf = np.zeros(self.max_points, dtype=np.float32)
+        self._head = 0
+        self._filled = 0
+        # Running amplitude range; rescanned only after an extreme is evicted
+        self._ymin_cache = np.inf
+        self._ymax_cache = -np.inf
+        self._yrange_stale = False
         
         self.current_command = "NONE"
         self.current_theta = 0.25
@@ -104,19 +136,38 @@ class CompleteBCIVisualizer:
         self.current_beta = 0.25
         self.current_gamma = 0.25
         self.led_state = False
+        self._band_heights = (0.25, 0.25, 0.25, 0.25)
         
         self.visual_impairment = "NORMAL"
         self.motor_impairment = "NORMAL"
         self.attention_deficit = "NORMAL"
         
+        # Names of panels whose source state changed since the last frame
+        self._dirty = set()
+        self._last_metric = {}
+        self._pie_fracs = None
+        
         self.riscv = RISCVSimulator()
         self.data_queue = queue.Queue()
         self.cycles_history = deque(maxlen=50)
         
+        # FFT bins and 0-50 Hz mask never change, so build them once
+        self._xf = rfftfreq(self.window_size, 1/self.sampling_rate)
+        self._mask = self._xf <= 50
+        self._xf_masked = self._xf[self._mask]
+        self._fft_buf = np.empty(self.window_size, dtype=np.float32)
+        
         self.setup_figure()
         
+        # Artists redrawn on every blitted frame; everything else is background
+        self._animated = (self.line_wave, self.line_spec, *self.bars, *self.health_txt.values(),
+                          *self.bench_bars, self.speed_txt, *self.metric_txt.values(),
+                          self.stall_txt, self.line_perf, *self.cache_bars,
+                          self.cache_txt, self.branch_txt)
+        
     def setup_figure(self):
         plt.style.use('default')
+        plt.rcParams.update(RENDER_PARAMS)
         self.fig = plt.figure(figsize=(22, 14), facecolor='white')
         self.fig.canvas.manager.set_window_title(f'BCI RISC-V Dashboard - {self.dataset_type}')
         
@@ -165,9 +216,13 @@ class CompleteBCIVisualizer:
         for spine in self.ax_wave.spines.values():
             spine.set_edgecolor('#00ff41')
             spine.set_linewidth(1.5)
-        self.line_wave, = self.ax_wave.plot([], [], color='#00ff41', linewidth=1)
+        self.line_wave, = self.ax_wave.plot([], [], color='#00ff41', linewidth=1,
+                                            antialiased=False, solid_joinstyle='miter')
         self.ax_wave.set_xlim(0, self.display_seconds)
         self.ax_wave.set_ylim(-10, 10)
+        # Cached axis limits
+        self._x_right = float(self.display_seconds)
+        self._last_ylim = (-10.0, 10.0)
         
     def setup_row1(self):
         # Spectrum - NO xlabel to avoid overlap
@@ -199,9 +254,16 @@ class CompleteBCIVisualizer:
         }
         
     def setup_row2(self):
-        # Pie
+        # Pie - wedges are created once and re-angled in update_pie()
         self.ax_pie.set_facecolor('white')
         self.ax_pie.set_title('Instructions', fontsize=10, fontweight='bold', pad=5)
+        labels = list(INSTRUCTION_TYPES)
+        self.pie_wedges, self.pie_texts, self.pie_autotexts = self.ax_pie.pie(
+            [1] * len(labels), labels=labels, autopct='%1.0f%%',
+            colors=['#3498db', '#9b59b6', '#e74c3c', '#f39c12', '#27ae60'],
+            textprops={'fontsize': 8})
+        for artist in (*self.pie_wedges, *self.pie_texts, *self.pie_autotexts):
+            artist.set_visible(False)
         
         # Benchmark
         self.ax_bench.set_facecolor('#fafafa')
@@ -259,17 +321,59 @@ class CompleteBCIVisualizer:
     def compute_fft(self, data):
         if len(data) < self.window_size:
             return None, None
-        arr = np.array(data)[-self.window_size:]
-        yf = np.abs(fft(arr))
-        xf = fftfreq(self.window_size, 1/self.sampling_rate)
-        mask = (xf >= 0) & (xf <= 50)
-        return xf[mask], yf[mask]
+        self._fft_buf[:] = data[-self.window_size:]
+        yf = np.abs(rfft(self._fft_buf))
+        return self._xf_masked, yf[self._mask]
+        
+    def _ordered(self, buf):
+        """Return the ring buffer contents oldest-first (a view unless wrapped)"""
+        if self._filled < self.max_points:
+            return buf[:self._filled]
+        if self._head == 0:
+            return buf
+        return np.concatenate((buf[self._head:], buf[:self._head]))
+        
+    def _y_range(self):
+        if self._yrange_stale:
+            valid = self._y_buf[:self._filled]
+            self._ymin_cache, self._ymax_cache = float(valid.min()), float(valid.max())
+            self._yrange_stale = False
+        return self._ymin_cache, self._ymax_cache
+        
+    def update_pie(self):
+        """Re-angle the existing pie wedges; returns True if anything moved"""
+        values = self.riscv.instruction_breakdown.astype(float)
+        total = values.sum()
+        if total <= 0:
+            return False
+        fracs = values / total
+        if self._pie_fracs is not None and np.allclose(fracs, self._pie_fracs):
+            return False
+        self._pie_fracs = fracs
+        bounds = 360 * np.concatenate(([0.0], np.cumsum(fracs)))
+        for i, (wedge, label, pct) in enumerate(zip(self.pie_wedges, self.pie_texts, self.pie_autotexts)):
+            t1, t2 = bounds[i], bounds[i + 1]
+            wedge.set_theta1(t1)
+            wedge.set_theta2(t2)
+            mid = np.deg2rad((t1 + t2) / 2)
+            x, y = np.cos(mid), np.sin(mid)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f'{fracs[i] * 100:.0f}%')
+            for artist in (wedge, label, pct):
+                artist.set_visible(True)
+        return True
         
     def update_plot(self, frame):
+        start = time.perf_counter()
         for _ in range(min(50, self.data_queue.qsize())):
             try:
                 data = self.data_queue.get_nowait()
-                self.process_data(data)
+                if isinstance(data, np.ndarray):
+                    self.process_records(data)
+                else:
+                    self.process_data(data)
             except:
                 break
                 
@@ -277,52 +381,70 @@ class CompleteBCIVisualizer:
             self.riscv.simulate_fft_processing()
             self.cycles_history.append(self.riscv.total_cycles % 15000)
         
-        if len(self.time_data) > 0:
-            t, y = list(self.time_data), list(self.signal_data)
-            if t[-1] > self.ax_wave.get_xlim()[1]:
-                self.ax_wave.set_xlim(t[-1] - self.display_seconds, t[-1])
-            if frame % 10 == 0 and len(y) > 0:
-                ymin, ymax = min(y), max(y)
+        # Limit changes and the pie live in the blit background and need a full draw
+        redraw = False
+        
+        if self._filled > 0:
+            t, y = self._ordered(self._t_buf), self._ordered(self._y_buf)
+            # Scroll in quarter-window steps
+            if t[-1] > self._x_right:
+                self._x_right = float(t[-1]) + self.display_seconds / 4
+                self.ax_wave.set_xlim(self._x_right - self.display_seconds, self._x_right)
+                redraw = True
+            if frame % 10 == 0:
+                ymin, ymax = self._y_range()
                 pad = max(10, (ymax - ymin) * 0.1)
-                self.ax_wave.set_ylim(ymin - pad, ymax + pad)
+                lo, hi = ymin - pad, ymax + pad
+                if abs(lo - self._last_ylim[0]) > 0.5 or abs(hi - self._last_ylim[1]) > 0.5:
+                    self.ax_wave.set_ylim(lo, hi)
+                    self._last_ylim = (lo, hi)
+                    redraw = True
             self.line_wave.set_data(t, y)
             
-        if frame % 5 == 0 and len(self.signal_data) >= self.window_size:
-            xf, yf = self.compute_fft(self.signal_data)
+        if frame % 5 == 0 and self._filled >= self.window_size:
+            xf, yf = self.compute_fft(y)
             if xf is not None:
                 self.line_spec.set_data(xf, yf)
                 
-        for bar, val in zip(self.bars, [self.current_theta, self.current_alpha, self.current_beta, self.current_gamma]):
-            bar.set_height(val)
+        if 'bands' in self._dirty:
+            for bar, val in zip(self.bars, self._band_heights):
+                bar.set_height(val)
             
-        # Update health prediction text
+        # Update health prediction text only when a prediction changed
         colors = {'NORMAL': '#27ae60', 'BORDERLINE': '#f39c12', 'IMPAIRED': '#c0392b'}
-        self.health_txt['v'].set_text(f'Visual: {self.visual_impairment}')
-        self.health_txt['v'].set_color(colors.get(self.visual_impairment, '#333'))
-        self.health_txt['m'].set_text(f'Motor: {self.motor_impairment}')
-        self.health_txt['m'].set_color(colors.get(self.motor_impairment, '#333'))
-        self.health_txt['a'].set_text(f'Attn: {self.attention_deficit}')
-        self.health_txt['a'].set_color(colors.get(self.attention_deficit, '#333'))
-        
-        if frame % 20 == 0:
-            self.ax_pie.clear()
-            self.ax_pie.set_title('Instructions', fontsize=10, fontweight='bold', pad=5)
-            bd = self.riscv.instruction_breakdown
-            if sum(bd.values()) > 0:
-                self.ax_pie.pie(bd.values(), labels=bd.keys(), autopct='%1.0f%%',
-                               colors=['#3498db', '#9b59b6', '#e74c3c', '#f39c12', '#27ae60'],
-                               textprops={'fontsize': 8})
+        if 'visual' in self._dirty:
+            self.health_txt['v'].set_text(f'Visual: {self.visual_impairment}')
+            self.health_txt['v'].set_color(colors.get(self.visual_impairment, '#333'))
+        if 'motor' in self._dirty:
+            self.health_txt['m'].set_text(f'Motor: {self.motor_impairment}')
+            self.health_txt['m'].set_color(colors.get(self.motor_impairment, '#333'))
+        if 'attn' in self._dirty:
+            self.health_txt['a'].set_text(f'Attn: {self.attention_deficit}')
+            self.health_txt['a'].set_color(colors.get(self.attention_deficit, '#333'))
+        self._dirty.clear()
+        
+        if frame % 20 == 0 and self.update_pie():
+            redraw = True
                                
         c, a = self.riscv.c_baseline_cycles, self.riscv.asm_optimized_cycles
         self.bench_bars[0].set_height(c)
         self.bench_bars[1].set_height(a)
-        self.ax_bench.set_ylim(0, max(c, a, 100) * 1.2)
+        bench_top = max(c, a, 100) * 1.2
+        if self.ax_bench.get_ylim()[1] != bench_top:
+            self.ax_bench.set_ylim(0, bench_top)
+            redraw = True
         self.speed_txt.set_text(f'{self.riscv.get_speedup():.1f}x')
         
-        self.metric_txt['inst'].set_text(f'Instr: {self.riscv.total_instructions:,}')
-        self.metric_txt['cyc'].set_text(f'Cycles: {self.riscv.total_cycles:,}')
-        self.metric_txt['ipc'].set_text(f'IPC: {self.riscv.get_ipc():.2f}')
-        self.metric_txt['stall'].set_text(f'Stalls: {self.riscv.pipeline_stalls:,}')
+        metrics = {
+            'inst': f'Instr: {self.riscv.total_instructions:,}',
+            'cyc': f'Cycles: {self.riscv.total_cycles:,}',
+            'ipc': f'IPC: {self.riscv.get_ipc():.2f}',
+            'stall': f'Stalls: {self.riscv.pipeline_stalls:,}'
+        }
+        for key, text in metrics.items():
+            if self._last_metric.get(key) != text:
+                self.metric_txt[key].set_text(text)
+                self._last_metric[key] = text
         
         self.stall_txt.set_text(f'Stalls: {self.riscv.pipeline_stalls:,}')
         
@@ -338,24 +460,83 @@ class CompleteBCIVisualizer:
         self.branch_txt.set_position((1, branch_acc / 2))
         self.branch_txt.set_text(f'{branch_acc:.0f}%')
         
-        return []
+        if redraw:
+            self.fig.canvas.draw()
+        self._pace_frames(start)
+        return self._animated
+        
+    def process_records(self, rec):
+        """Append a SAMPLE_DTYPE batch in one vectorized write; state comes from the last record"""
+        if len(rec) == 0:
+            return
+        rec = rec[-self.max_points:]
+        pos = (self._head + np.arange(len(rec))) % self.max_points
+        evicted = self._y_buf[pos if self._filled == self.max_points else pos[pos < self._filled]]
+        if evicted.size and (evicted.min() <= self._ymin_cache or evicted.max() >= self._ymax_cache):
+            self._yrange_stale = True
+        self._t_buf[pos] = rec['time']
+        self._y_buf[pos] = rec['amp']
+        self._ymin_cache = min(self._ymin_cache, float(rec['amp'].min()))
+        self._ymax_cache = max(self._ymax_cache, float(rec['amp'].max()))
+        self._head = (self._head + len(rec)) % self.max_points
+        self._filled = min(self._filled + len(rec), self.max_points)
+        
+        last = rec[-1]
+        self.update_state({
+            'command': self.labels['cmd'][last['cmd']],
+            'theta_power': float(last['theta']),
+            'alpha_power': float(last['alpha']),
+            'beta_power': float(last['beta']),
+            'gamma_power': float(last['gamma']),
+            'led_state': bool(last['led']),
+            'visual_impairment': self.labels['v'][last['v']],
+            'motor_impairment': self.labels['m'][last['m']],
+            'attention_deficit': self.labels['a'][last['a']]
+        })
         
     def process_data(self, data):
-        self.time_data.append(data['time'])
-        self.signal_data.append(data['amplitude'])
+        if self._filled == self.max_points:
+            evicted = self._y_buf[self._head]
+            if evicted <= self._ymin_cache or evicted >= self._ymax_cache:
+                self._yrange_stale = True
+        self._t_buf[self._head] = data['time']
+        self._y_buf[self._head] = data['amplitude']
+        amp = float(self._y_buf[self._head])
+        if amp < self._ymin_cache: self._ymin_cache = amp
+        if amp > self._ymax_cache: self._ymax_cache = amp
+        self._head = (self._head + 1) % self.max_points
+        if self._filled < self.max_points:
+            self._filled += 1
+        self.update_state(data)
+        
+    def update_state(self, data):
         if 'command' in data: self.current_command = data['command']
         if 'theta_power' in data: self.current_theta = data['theta_power']
         if 'alpha_power' in data: self.current_alpha = data['alpha_power']
         if 'beta_power' in data: self.current_beta = data['beta_power']
         if 'gamma_power' in data: self.current_gamma = data['gamma_power']
+        bands = (self.current_theta, self.current_alpha, self.current_beta, self.current_gamma)
+        if bands != self._band_heights:
+            self._band_heights = bands
+            self._dirty.add('bands')
         if 'led_state' in data: self.led_state = data['led_state']
-        if 'visual_impairment' in data: self.visual_impairment = data['visual_impairment']
-        if 'motor_impairment' in data: self.motor_impairment = data['motor_impairment']
-        if 'attention_deficit' in data: self.attention_deficit = data['attention_deficit']
+        if 'visual_impairment' in data and data['visual_impairment'] != self.visual_impairment:
+            self.visual_impairment = data['visual_impairment']
+            self._dirty.add('visual')
+        if 'motor_impairment' in data and data['motor_impairment'] != self.motor_impairment:
+            self.motor_impairment = data['motor_impairment']
+            self._dirty.add('motor')
+        if 'attention_deficit' in data and data['attention_deficit'] != self.attention_deficit:
+            self.attention_deficit = data['attention_deficit']
+            self._dirty.add('attn')
 
 
+# Low-cardinality text columns, read as categoricals so comparisons run on codes
+LABEL_COLUMNS = ('command', 'visual_impairment', 'motor_impairment', 'attention_deficit')
+
 def load_and_visualize(filepath, dataset_type):
     import pandas as pd
+    from importlib.util import find_spec
     
     print(f"Loading: {filepath}")
     
@@ -363,36 +544,58 @@ def load_and_visualize(filepath, dataset_type):
         print(f"ERROR: File not found")
         return
         
-    df = pd.read_csv(filepath)
+    if filepath.endswith('.parquet'):
+        # Label columns come back as categoricals from the Parquet dictionaries
+        df = pd.read_parquet(filepath)
+    else:
+        header = pd.read_csv(filepath, nrows=0).columns
+        dtypes = {c: 'category' for c in LABEL_COLUMNS if c in header}
+        engine = 'pyarrow' if find_spec('pyarrow') is not None else 'c'
+        df = pd.read_csv(filepath, engine=engine, dtype=dtypes)
     print(f"Loaded {len(df)} samples")
     
     vis = CompleteBCIVisualizer(filepath, dataset_type)
     
+    # Pack the whole DataFrame into one record array; missing columns keep their defaults
+    n = len(df)
+    records = np.zeros(n, dtype=SAMPLE_DTYPE)
+    records['time'] = df['time']
+    records['amp'] = df['amplitude']
+    for name, field in (('theta_power', 'theta'), ('alpha_power', 'alpha'),
+                        ('beta_power', 'beta'), ('gamma_power', 'gamma')):
+        records[field] = df[name] if name in df.columns else 0.25
+    
+    def pack_labels(name, field):
+        """Store a label column as codes; other values (and NaN) get codes past the known labels"""
+        if name not in df.columns:
+            return
+        cat = pd.Categorical(df[name])
+        extra = [c for c in cat.categories if c not in vis.labels[field]]
+        c = cat.set_categories(list(vis.labels[field]) + extra).codes
+        names = vis.labels[field] + tuple(str(x) for x in extra) + ('nan',)
+        records[field] = np.where(c < 0, len(names) - 1, c)
+        vis.labels[field] = names
+    
+    pack_labels('visual_impairment', 'v')
+    pack_labels('motor_impairment', 'm')
+    pack_labels('attention_deficit', 'a')
+    pack_labels('command', 'cmd')
+    # Code 0 is NORMAL, so unknown labels light the LED like any other non-NORMAL one
+    records['led'] = (records['v'] != 0) | (records['m'] != 0) | (records['a'] != 0)
+    
+    # Records are queued in slices so the feeder locks the queue and sleeps once per batch
+    BATCH = 16
+    
     def feed_data():
-        for _, row in df.iterrows():
-            led_on = (row.get('visual_impairment', 'NORMAL') != 'NORMAL' or
-                     row.get('motor_impairment', 'NORMAL') != 'NORMAL' or
-                     row.get('attention_deficit', 'NORMAL') != 'NORMAL')
-            
-            vis.data_queue.put({
-                'time': row['time'],
-                'amplitude': row['amplitude'],
-                'command': row.get('command', 'NONE'),
-                'theta_power': row.get('theta_power', 0.25),
-                'alpha_power': row.get('alpha_power', 0.25),
-                'beta_power': row.get('beta_power', 0.25),
-                'gamma_power': row.get('gamma_power', 0.25),
-                'led_state': led_on,
-                'visual_impairment': row.get('visual_impairment', 'NORMAL'),
-                'motor_impairment': row.get('motor_impairment', 'NORMAL'),
-                'attention_deficit': row.get('attention_deficit', 'NORMAL')
-            })
-            time.sleep(0.008)
+        for i in range(0, n, BATCH):
+            vis.data_queue.put(records[i:i + BATCH])
+            time.sleep(0.008 * BATCH)
         print("Done!")
     
     threading.Thread(target=feed_data, daemon=True).start()
     
-    anim = animation.FuncAnimation(vis.fig, vis.update_plot, interval=vis.update_interval, blit=False, cache_frame_data=False)
+    anim = animation.FuncAnimation(vis.fig, vis.update_plot, interval=vis.update_interval, blit=True, cache_frame_data=False)
+    vis.anim = anim
     plt.show()
 
 
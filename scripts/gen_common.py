@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the EEG dataset generators
+(generate_enhanced_data.py and generate_separate_datasets.py)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+# Optional: Arrow's C++ CSV writer (falls back to pandas)
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+# Configuration
+SAMPLING_RATE = 256  # Hz
+DURATION = 10  # seconds
+
+# Frequency bands (Hz)
+THETA_FREQ = 6.0
+ALPHA_FREQ = 10.0
+BETA_FREQ = 20.0
+GAMMA_FREQ = 40.0
+
+BAND_FREQS = (THETA_FREQ, ALPHA_FREQ, BETA_FREQ, GAMMA_FREQ)
+
+# Output columns
+COMMANDS = ["NONE", "FOCUS", "RELAX", "BLINK"]
+STATUS_LEVELS = ["NORMAL", "BORDERLINE", "IMPAIRED"]
+
+# Cache for the precomputed sine basis, one file per sampling rate
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(os.path.dirname(script_dir), "data", "cache")
+
+def band_basis(num_samples, sampling_rate=SAMPLING_RATE):
+    """Stack the four band carriers sin(2*pi*freq*n/sampling_rate) for n = 0..num_samples-1.
+
+    Each row is the impulse response of the resonator
+    s[n] = 2*cos(step)*s[n-1] - s[n-2], so scipy's lfilter produces it with
+    two multiply-adds per sample instead of a sin() evaluation. The basis is
+    saved under CACHE_DIR and memory-mapped (read-only) on later runs; shorter
+    requests slice the cached one, longer ones replace it.
+    """
+    freqs = '_'.join(f"{freq:g}" for freq in BAND_FREQS)
+    path = os.path.join(CACHE_DIR, f"sine_basis_{sampling_rate}hz_{freqs}.npy")
+    if os.path.exists(path):
+        basis = np.load(path, mmap_mode='r')
+        if basis.shape[1] >= num_samples:
+            return basis[:, :num_samples]
+
+    # Phase advance per sample (radians) of each band carrier
+    steps = 2 * np.pi * np.array(BAND_FREQS) / sampling_rate
+    impulse = np.zeros(num_samples)
+    impulse[0] = 1.0
+    basis = np.array([lfilter([0.0, np.sin(step)], [1.0, -2 * np.cos(step), 1.0], impulse)
+                      for step in steps], dtype=np.float32)
+
+    # Write to a private temp file first so a concurrent run never maps a partial file
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix='.tmp', delete=False) as f:
+        np.save(f, basis)
+    os.replace(f.name, path)
+    return basis
+
+def save_csv(df, path):
+    """Write a dataset to CSV, using pyarrow when it is installed.
+
+    Without pyarrow every row is rendered through one fixed-precision template
+    (3 decimals for time, 2 for the rest) and the file is written in one call,
+    which avoids DataFrame.to_csv's per-cell formatting.
+    """
+    header = ','.join(df.columns) + '\n'
+    if pa is not None:
+        # pyarrow quotes header names even with quoting_style='none', so write them here
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with open(path, 'wb') as f:
+            f.write(header.encode())
+            pacsv.write_csv(table, f, pacsv.WriteOptions(include_header=False, quoting_style='none'))
+        return
+
+    fields, columns = [], []
+    for name in df.columns:
+        col = df[name]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            fields.append('%s')
+            columns.append(np.asarray(col.cat.categories, dtype=object)[col.cat.codes].tolist())
+        else:
+            fields.append('%.3f' if name == 'time' else '%.2f')
+            columns.append(col.to_numpy(np.float64).tolist())
+    row = ','.join(fields)
+    with open(path, 'w', newline='') as f:
+        f.write(header)
+        f.write('\n'.join([row % values for values in zip(*columns)]) + '\n')
+
+def save_dataset(df, path, fmt='csv'):
+    """Save a dataset as CSV or zstd-compressed Parquet; returns the path written"""
+    path = os.path.splitext(path)[0] + '.' + fmt
+    if fmt == 'parquet':
+        # Label columns are categorical, so pyarrow dictionary-encodes them
+        df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+    else:
+        save_csv(df, path)
+    return path
+
+def generation_params(args):
+    """The options that change a dataset's contents"""
+    return {'sampling_rate': args.sampling_rate, 'duration': args.duration}
+
+def _stamp_path(path):
+    """Where the parameters path was generated with are kept (under CACHE_DIR, keyed by path)"""
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, "params", f"{os.path.basename(path)}.{key}.json")
+
+def is_up_to_date(path, script, params):
+    """True if path was written after script (or these helpers) last changed, with the same params"""
+    stamp = _stamp_path(path)
+    if not (os.path.exists(path) and os.path.exists(stamp)):
+        return False
+    if os.path.getmtime(path) <= max(os.path.getmtime(script), os.path.getmtime(__file__)):
+        return False
+    with open(stamp) as f:
+        return json.load(f) == params
+
+def record_params(path, params):
+    """Store the parameters path was generated with, for is_up_to_date"""
+    stamp = _stamp_path(path)
+    os.makedirs(os.path.dirname(stamp), exist_ok=True)
+    with open(stamp, 'w') as f:
+        json.dump(params, f)
+
+def _positive(type_):
+    """argparse type= callable accepting only values > 0"""
+    def convert(value):
+        number = type_(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+        return number
+    convert.__name__ = type_.__name__
+    return convert
+
+def parse_args(description, default_out, out_help):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--sampling-rate', type=_positive(int), default=SAMPLING_RATE,
+                        help=f"Samples per second (default: {SAMPLING_RATE})")
+    parser.add_argument('--duration', type=_positive(float), default=DURATION,
+                        help=f"Recording length in seconds (default: {DURATION})")
+    parser.add_argument('--out', default=default_out, help=out_help)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help="Output format (parquet requires pyarrow)")
+    parser.add_argument('--force', action='store_true',
+                        help="Regenerate even if the output is up to date")
+    args = parser.parse_args()
+    if args.format == 'parquet' and pa is None:
+        parser.error("--format parquet requires pyarrow (pip install pyarrow)")
+    return args
@@ -13,152 +13,119 @@ import numpy as np
 import pandas as pd
 import os
 
+from gen_common import (SAMPLING_RATE, DURATION, COMMANDS, STATUS_LEVELS,
+                        band_basis, save_dataset, parse_args,
+                        generation_params, is_up_to_date, record_params)
+
 # Configuration
-SAMPLING_RATE = 256  # Hz
-DURATION = 10  # seconds
-NUM_SAMPLES = SAMPLING_RATE * DURATION
+SEED = None  # Set to an int for reproducible datasets
+
+rng = np.random.default_rng(SEED)
 
-# Frequency bands (Hz)
-THETA_FREQ = 6.0
-ALPHA_FREQ = 10.0
-BETA_FREQ = 20.0
-GAMMA_FREQ = 40.0
+# Scenario schedule: window end times (s); the last window runs to DURATION
+SCENARIO_ENDS = np.array([2.0, 4.0, 6.0, 7.0, 8.0, 9.0])
+SCENARIO_AMPS = np.array([
+    # theta, alpha, beta, gamma
+    [15, 50, 30, 10],   # 0-2s:  Normal baseline state
+    [10, 20, 60, 15],   # 2-4s:  FOCUS state (high beta)
+    [15, 65, 20, 8],    # 4-6s:  RELAX state (high alpha)
+    [25, 15, 35, 12],   # 6-7s:  Visual impairment scenario (low alpha)
+    [20, 45, 10, 15],   # 7-8s:  Motor impairment scenario (low beta)
+    [50, 25, 15, 8],    # 8-9s:  Attention deficit scenario (high theta, low beta)
+    [20, 35, 30, 12],   # 9-10s: Mixed scenario
+], dtype=np.float32)
+SCENARIO_COMMANDS = np.array(["NONE", "FOCUS", "RELAX", "NONE", "NONE", "NONE", "NONE"])
 
-def generate_band_signal(freq, amplitude, duration, phase=0):
-    """Generate a sinusoidal signal for a specific frequency band"""
-    t = np.arange(0, duration, 1/SAMPLING_RATE)
-    return amplitude * np.sin(2 * np.pi * freq * t + phase)
+def composite_signal(amps, sampling_rate=SAMPLING_RATE, noise_level=5.0):
+    """Sum the four band sinusoids plus noise.
 
-def add_noise(signal, noise_level=5.0):
-    """Add realistic noise to signal"""
-    return signal + np.random.normal(0, noise_level, len(signal))
+    amps holds the (theta, alpha, beta, gamma) amplitude arrays. Each band is
+    accumulated into one output buffer in place, so no per-band arrays are kept.
+    """
+    out = np.zeros(len(amps[0]), np.float32)
+    band = np.empty_like(out)
+    for amp, basis_row in zip(amps, band_basis(len(out), sampling_rate)):
+        np.multiply(basis_row, amp, out=band)
+        out += band
+    out += rng.standard_normal(len(out), dtype=np.float32) * np.float32(noise_level)
+    return out
 
-def generate_eeg_data():
+def generate_eeg_data(sampling_rate=SAMPLING_RATE, duration=DURATION):
     """Generate complete EEG dataset with all scenarios"""
     
-    t = np.arange(0, DURATION, 1/SAMPLING_RATE)
-    data = []
-    
-    for i, time in enumerate(t):
-        # Determine current scenario based on time
-        if time < 2.0:
-            # Normal baseline state
-            scenario = "normal"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 15, 50, 30, 10
-            command = "NONE"
-        elif time < 4.0:
-            # FOCUS state (high beta)
-            scenario = "focus"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 10, 20, 60, 15
-            command = "FOCUS"
-        elif time < 6.0:
-            # RELAX state (high alpha)
-            scenario = "relax"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 15, 65, 20, 8
-            command = "RELAX"
-        elif time < 7.0:
-            # Visual impairment scenario (low alpha)
-            scenario = "visual_impaired"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 25, 15, 35, 12
-            command = "NONE"
-        elif time < 8.0:
-            # Motor impairment scenario (low beta)
-            scenario = "motor_impaired"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 20, 45, 10, 15
-            command = "NONE"
-        elif time < 9.0:
-            # Attention deficit scenario (high theta, low beta)
-            scenario = "attention_deficit"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 50, 25, 15, 8
-            command = "NONE"
-        else:
-            # Mixed scenario
-            scenario = "mixed"
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 20, 35, 30, 12
-            command = "NONE"
-        
-        # Generate composite signal
-        theta_signal = generate_band_signal(THETA_FREQ, theta_amp, 1/SAMPLING_RATE, i*0.1)
-        alpha_signal = generate_band_signal(ALPHA_FREQ, alpha_amp, 1/SAMPLING_RATE, i*0.15)
-        beta_signal = generate_band_signal(BETA_FREQ, beta_amp, 1/SAMPLING_RATE, i*0.2)
-        gamma_signal = generate_band_signal(GAMMA_FREQ, gamma_amp, 1/SAMPLING_RATE, i*0.3)
-        
-        # Composite amplitude
-        amplitude = theta_signal + alpha_signal + beta_signal + gamma_signal
-        
-        # Add noise
-        amplitude = add_noise(np.array([amplitude]), noise_level=5.0)[0]
-        amplitude = float(amplitude)  # Convert from numpy to python float
-        
-        # Add occasional blink artifacts
-        if i % 512 == 0 and i > 0:
-            amplitude += 150 * np.random.random()
-            command = "BLINK"
-        
-        # Calculate normalized band powers
-        total_power = theta_amp + alpha_amp + beta_amp + gamma_amp
-        theta_power = theta_amp / total_power
-        alpha_power = alpha_amp / total_power
-        beta_power = beta_amp / total_power
-        gamma_power = gamma_amp / total_power
-        
-        # Predict health impairments
-        # Visual: based on alpha power
-        if alpha_power >= 0.35:
-            visual_impairment = "NORMAL"
-        elif alpha_power >= 0.25:
-            visual_impairment = "BORDERLINE"
-        else:
-            visual_impairment = "IMPAIRED"
-        
-        # Motor: based on beta power
-        if beta_power >= 0.30:
-            motor_impairment = "NORMAL"
-        elif beta_power >= 0.20:
-            motor_impairment = "BORDERLINE"
-        else:
-            motor_impairment = "IMPAIRED"
-        
-        # Attention: based on theta/beta ratio
-        theta_beta_ratio = theta_power / beta_power if beta_power > 0.01 else 10.0
-        if theta_beta_ratio <= 1.5:
-            attention_deficit = "NORMAL"
-        elif theta_beta_ratio <= 2.0:
-            attention_deficit = "BORDERLINE"
-        else:
-            attention_deficit = "IMPAIRED"
-        
-        # Store data point
-        data.append({
-            'time': round(time, 3),
-            'amplitude': round(amplitude, 2),
-            'theta_power': round(theta_power, 2),
-            'alpha_power': round(alpha_power, 2),
-            'beta_power': round(beta_power, 2),
-            'gamma_power': round(gamma_power, 2),
-            'command': command,
-            'visual_impairment': visual_impairment,
-            'motor_impairment': motor_impairment,
-            'attention_deficit': attention_deficit
-        })
-    
-    return pd.DataFrame(data)
+    n = np.arange(int(sampling_rate * duration))
+    t = n.astype(np.float32) / sampling_rate
+    
+    # Look up each sample's scenario row in the schedule table
+    scenario = np.searchsorted(SCENARIO_ENDS * sampling_rate, n, side='right')
+    amps = SCENARIO_AMPS[scenario]
+    command = pd.Categorical(SCENARIO_COMMANDS, categories=COMMANDS).codes[scenario]
+    
+    # Generate composite signal with noise
+    amplitude = composite_signal(amps.T, sampling_rate, noise_level=5.0)
+    
+    # Add occasional blink artifacts (every 2 seconds)
+    blink_idx = np.arange(2 * sampling_rate, len(t), 2 * sampling_rate)
+    amplitude[blink_idx] += 150 * rng.random(len(blink_idx), dtype=np.float32)
+    command[blink_idx] = COMMANDS.index("BLINK")
+    
+    # Calculate normalized band powers (in float64 so the label thresholds compare exactly)
+    powers = amps / amps.sum(axis=1, keepdims=True, dtype=np.float64)
+    theta_power, alpha_power, beta_power, gamma_power = powers.T
+    
+    # Predict health impairments as STATUS_LEVELS codes (0 NORMAL, 1 BORDERLINE, 2 IMPAIRED)
+    # Visual: based on alpha power (>= 0.35 normal, >= 0.25 borderline)
+    visual_impairment = 2 - np.digitize(alpha_power, [0.25, 0.35])
+    
+    # Motor: based on beta power (>= 0.30 normal, >= 0.20 borderline)
+    motor_impairment = 2 - np.digitize(beta_power, [0.20, 0.30])
+    
+    # Attention: based on theta/beta ratio (<= 1.5 normal, <= 2.0 borderline)
+    theta_beta_ratio = np.divide(theta_power, beta_power, out=np.full_like(theta_power, 10.0),
+                                 where=beta_power > 0.01)
+    attention_deficit = np.digitize(theta_beta_ratio, [1.5, 2.0], right=True)
+    
+    # Round in bulk; powers drop to float32 once the labels are derived
+    np.round(t, 3, out=t)
+    np.round(amplitude, 2, out=amplitude)
+    np.round(powers, 2, out=powers)
+    theta_power, alpha_power, beta_power, gamma_power = powers.astype(np.float32).T
+    
+    return pd.DataFrame({
+        'time': t,
+        'amplitude': amplitude,
+        'theta_power': theta_power,
+        'alpha_power': alpha_power,
+        'beta_power': beta_power,
+        'gamma_power': gamma_power,
+        'command': pd.Categorical.from_codes(command, COMMANDS),
+        'visual_impairment': pd.Categorical.from_codes(visual_impairment, STATUS_LEVELS),
+        'motor_impairment': pd.Categorical.from_codes(motor_impairment, STATUS_LEVELS),
+        'attention_deficit': pd.Categorical.from_codes(attention_deficit, STATUS_LEVELS)
+    })
 
 def main():
+    args = parse_args(__doc__.strip().splitlines()[0], "data/raw/sample_eeg_data.csv",
+                      "Output file (default: %(default)s)")
+    output_path = os.path.splitext(args.out)[0] + '.' + args.format
+    params = generation_params(args)
+    if not args.force and is_up_to_date(output_path, __file__, params):
+        print(f"✅ {output_path} is up to date (use --force to regenerate)")
+        return
+    
+    num_samples = int(args.sampling_rate * args.duration)
     print("🧠 Generating Enhanced EEG Sample Data...")
-    print(f"📊 Parameters: {SAMPLING_RATE}Hz, {DURATION}s, {NUM_SAMPLES} samples")
+    print(f"📊 Parameters: {args.sampling_rate}Hz, {args.duration:g}s, {num_samples} samples")
     
     # Generate data
-    df = generate_eeg_data()
-    
-    # Save to file
-    output_path = "data/raw/sample_eeg_data.csv"
+    df = generate_eeg_data(args.sampling_rate, args.duration)
     
     # Ensure directory exists
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
     
     # Save
-    df.to_csv(output_path, index=False)
+    output_path = save_dataset(df, output_path, args.format)
+    record_params(output_path, params)
     
     print(f"✅ Generated {len(df)} samples")
     print(f"📁 Saved to: {output_path}")
@@ -14,260 +14,124 @@ import numpy as np
 import pandas as pd
 import os
 
+from gen_common import (SAMPLING_RATE, DURATION, COMMANDS, STATUS_LEVELS,
+                        band_basis, save_dataset, parse_args,
+                        generation_params, is_up_to_date, record_params)
+
 # Configuration
-SAMPLING_RATE = 256  # Hz
-DURATION = 10  # seconds
-NUM_SAMPLES = SAMPLING_RATE * DURATION
+SEED = None  # Set to an int for reproducible datasets
 
-# Frequency bands (Hz)
-THETA_FREQ = 6.0
-ALPHA_FREQ = 10.0
-BETA_FREQ = 20.0
-GAMMA_FREQ = 40.0
+rng = np.random.default_rng(SEED)
 
-def generate_band_signal(freq, amplitude, duration, phase=0):
-    """Generate a sinusoidal signal for a specific frequency band"""
-    t = np.arange(0, duration, 1/SAMPLING_RATE)
-    return amplitude * np.sin(2 * np.pi * freq * t + phase)
+# Scenario windows shared by all three datasets: end times (s), with the last
+# window running to DURATION, and the expected status of each window
+WINDOW_ENDS = np.array([2.0, 4.0, 6.0, 8.0])
+WINDOW_STATUS = np.array(["NORMAL", "NORMAL", "BORDERLINE", "IMPAIRED", "IMPAIRED"])
 
-def add_noise(signal, noise_level=5.0):
-    """Add realistic noise to signal"""
-    return signal + np.random.normal(0, noise_level, len(signal))
+# Band amplitudes per window (theta, alpha, beta, gamma)
+VISUAL_AMPS = np.array([
+    [15, 55, 30, 10],   # 0-2s:  Normal alpha - good visual processing
+    [12, 65, 28, 8],    # 2-4s:  High alpha - excellent visual processing
+    [18, 35, 32, 12],   # 4-6s:  Borderline alpha - slight visual concerns
+    [25, 18, 38, 15],   # 6-8s:  Low alpha - visual impairment
+    [30, 12, 40, 18],   # 8-10s: Very low alpha - severe visual impairment
+], dtype=np.float32)
+MOTOR_AMPS = np.array([
+    [12, 35, 60, 10],   # 0-2s:  High beta - good motor control
+    [15, 38, 45, 12],   # 2-4s:  Normal beta - healthy motor function
+    [20, 42, 30, 15],   # 4-6s:  Borderline beta - slight motor concerns
+    [25, 48, 18, 18],   # 6-8s:  Low beta - motor impairment
+    [30, 52, 10, 20],   # 8-10s: Very low beta - severe motor impairment
+], dtype=np.float32)
+ATTENTION_AMPS = np.array([
+    [10, 35, 50, 12],   # 0-2s:  Low theta, high beta - good attention (ratio ~0.5)
+    [20, 38, 40, 15],   # 2-4s:  Normal ratio (~1.0) - healthy attention
+    [35, 40, 30, 12],   # 4-6s:  Borderline ratio (~1.75) - slight attention concerns
+    [50, 42, 20, 10],   # 6-8s:  High ratio (~2.5) - attention deficit
+    [60, 45, 12, 8],    # 8-10s: Very high ratio (~5.0) - severe attention deficit
+], dtype=np.float32)
 
-def generate_visual_impairment_dataset():
-    """Generate dataset focused on visual impairment (alpha power variations)"""
-    print("📊 Generating Visual Impairment Dataset...")
-    
-    t = np.arange(0, DURATION, 1/SAMPLING_RATE)
-    data = []
-    
-    for i, time in enumerate(t):
-        # Vary alpha power to demonstrate visual impairment detection
-        if time < 2.0:
-            # Normal alpha - good visual processing
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 15, 55, 30, 10
-            visual_status = "NORMAL"
-        elif time < 4.0:
-            # High alpha - excellent visual processing
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 12, 65, 28, 8
-            visual_status = "NORMAL"
-        elif time < 6.0:
-            # Borderline alpha - slight visual concerns
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 18, 35, 32, 12
-            visual_status = "BORDERLINE"
-        elif time < 8.0:
-            # Low alpha - visual impairment
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 25, 18, 38, 15
-            visual_status = "IMPAIRED"
-        else:
-            # Very low alpha - severe visual impairment
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 30, 12, 40, 18
-            visual_status = "IMPAIRED"
-        
-        # Generate composite signal
-        theta_signal = generate_band_signal(THETA_FREQ, theta_amp, 1/SAMPLING_RATE, i*0.1)
-        alpha_signal = generate_band_signal(ALPHA_FREQ, alpha_amp, 1/SAMPLING_RATE, i*0.15)
-        beta_signal = generate_band_signal(BETA_FREQ, beta_amp, 1/SAMPLING_RATE, i*0.2)
-        gamma_signal = generate_band_signal(GAMMA_FREQ, gamma_amp, 1/SAMPLING_RATE, i*0.3)
-        
-        amplitude = theta_signal + alpha_signal + beta_signal + gamma_signal
-        amplitude = add_noise(np.array([amplitude]), noise_level=5.0)[0]
-        amplitude = float(amplitude)
-        
-        # Calculate normalized band powers
-        total_power = theta_amp + alpha_amp + beta_amp + gamma_amp
-        theta_power = theta_amp / total_power
-        alpha_power = alpha_amp / total_power
-        beta_power = beta_amp / total_power
-        gamma_power = gamma_amp / total_power
-        
-        # Command detection (secondary to visual prediction)
-        if beta_power > 0.6:
-            command = "FOCUS"
-        elif alpha_power > 0.6:
-            command = "RELAX"
-        else:
-            command = "NONE"
-        
-        data.append({
-            'time': round(time, 3),
-            'amplitude': round(amplitude, 2),
-            'theta_power': round(theta_power, 2),
-            'alpha_power': round(alpha_power, 2),
-            'beta_power': round(beta_power, 2),
-            'gamma_power': round(gamma_power, 2),
-            'command': command,
-            'visual_impairment': visual_status
-        })
-    
-    return pd.DataFrame(data)
+# (title, label column, output file name, amplitude table) for each dataset
+DATASETS = [
+    ("Visual Impairment", 'visual_impairment', "visual_impairment_data.csv", VISUAL_AMPS),
+    ("Motor Impairment", 'motor_impairment', "motor_impairment_data.csv", MOTOR_AMPS),
+    ("Attention Deficit", 'attention_deficit', "attention_deficit_data.csv", ATTENTION_AMPS),
+]
 
-def generate_motor_impairment_dataset():
-    """Generate dataset focused on motor impairment (beta power variations)"""
-    print("📊 Generating Motor Impairment Dataset...")
-    
-    t = np.arange(0, DURATION, 1/SAMPLING_RATE)
-    data = []
-    
-    for i, time in enumerate(t):
-        # Vary beta power to demonstrate motor impairment detection
-        if time < 2.0:
-            # High beta - good motor control
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 12, 35, 60, 10
-            motor_status = "NORMAL"
-        elif time < 4.0:
-            # Normal beta - healthy motor function
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 15, 38, 45, 12
-            motor_status = "NORMAL"
-        elif time < 6.0:
-            # Borderline beta - slight motor concerns
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 20, 42, 30, 15
-            motor_status = "BORDERLINE"
-        elif time < 8.0:
-            # Low beta - motor impairment
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 25, 48, 18, 18
-            motor_status = "IMPAIRED"
-        else:
-            # Very low beta - severe motor impairment
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 30, 52, 10, 20
-            motor_status = "IMPAIRED"
-        
-        # Generate composite signal
-        theta_signal = generate_band_signal(THETA_FREQ, theta_amp, 1/SAMPLING_RATE, i*0.1)
-        alpha_signal = generate_band_signal(ALPHA_FREQ, alpha_amp, 1/SAMPLING_RATE, i*0.15)
-        beta_signal = generate_band_signal(BETA_FREQ, beta_amp, 1/SAMPLING_RATE, i*0.2)
-        gamma_signal = generate_band_signal(GAMMA_FREQ, gamma_amp, 1/SAMPLING_RATE, i*0.3)
-        
-        amplitude = theta_signal + alpha_signal + beta_signal + gamma_signal
-        amplitude = add_noise(np.array([amplitude]), noise_level=5.0)[0]
-        amplitude = float(amplitude)
-        
-        # Calculate normalized band powers
-        total_power = theta_amp + alpha_amp + beta_amp + gamma_amp
-        theta_power = theta_amp / total_power
-        alpha_power = alpha_amp / total_power
-        beta_power = beta_amp / total_power
-        gamma_power = gamma_amp / total_power
-        
-        # Command detection
-        if beta_power > 0.6:
-            command = "FOCUS"
-        elif alpha_power > 0.6:
-            command = "RELAX"
-        else:
-            command = "NONE"
-        
-        data.append({
-            'time': round(time, 3),
-            'amplitude': round(amplitude, 2),
-            'theta_power': round(theta_power, 2),
-            'alpha_power': round(alpha_power, 2),
-            'beta_power': round(beta_power, 2),
-            'gamma_power': round(gamma_power, 2),
-            'command': command,
-            'motor_impairment': motor_status
-        })
-    
-    return pd.DataFrame(data)
+def build_dataset(t, amps, amplitude, label_column, status):
+    """Assemble one dataset from its per-sample band amplitudes and signal"""
+    # Calculate normalized band powers (in float64 so the label thresholds compare exactly)
+    powers = amps / amps.sum(axis=1, keepdims=True, dtype=np.float64)
+    theta_power, alpha_power, beta_power, gamma_power = powers.T
+    
+    # Command detection (secondary to the dataset's prediction), as COMMANDS codes
+    command = np.where(beta_power > 0.6, COMMANDS.index("FOCUS"),
+                       np.where(alpha_power > 0.6, COMMANDS.index("RELAX"), COMMANDS.index("NONE")))
+    
+    # Round in bulk; powers drop to float32 once the labels are derived
+    np.round(amplitude, 2, out=amplitude)
+    np.round(powers, 2, out=powers)
+    theta_power, alpha_power, beta_power, gamma_power = powers.astype(np.float32).T
+    
+    return pd.DataFrame({
+        'time': t,
+        'amplitude': amplitude,
+        'theta_power': theta_power,
+        'alpha_power': alpha_power,
+        'beta_power': beta_power,
+        'gamma_power': gamma_power,
+        'command': pd.Categorical.from_codes(command, COMMANDS),
+        label_column: pd.Categorical(status, categories=STATUS_LEVELS)
+    })
 
-def generate_attention_deficit_dataset():
-    """Generate dataset focused on attention deficit (theta/beta ratio variations)"""
-    print("📊 Generating Attention Deficit Dataset...")
-    
-    t = np.arange(0, DURATION, 1/SAMPLING_RATE)
-    data = []
-    
-    for i, time in enumerate(t):
-        # Vary theta/beta ratio to demonstrate attention deficit detection
-        if time < 2.0:
-            # Low theta, high beta - good attention (ratio ~0.5)
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 10, 35, 50, 12
-            attention_status = "NORMAL"
-        elif time < 4.0:
-            # Normal ratio (~1.0) - healthy attention
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 20, 38, 40, 15
-            attention_status = "NORMAL"
-        elif time < 6.0:
-            # Borderline ratio (~1.75) - slight attention concerns
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 35, 40, 30, 12
-            attention_status = "BORDERLINE"
-        elif time < 8.0:
-            # High ratio (~2.5) - attention deficit
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 50, 42, 20, 10
-            attention_status = "IMPAIRED"
-        else:
-            # Very high ratio (~5.0) - severe attention deficit
-            theta_amp, alpha_amp, beta_amp, gamma_amp = 60, 45, 12, 8
-            attention_status = "IMPAIRED"
-        
-        # Generate composite signal
-        theta_signal = generate_band_signal(THETA_FREQ, theta_amp, 1/SAMPLING_RATE, i*0.1)
-        alpha_signal = generate_band_signal(ALPHA_FREQ, alpha_amp, 1/SAMPLING_RATE, i*0.15)
-        beta_signal = generate_band_signal(BETA_FREQ, beta_amp, 1/SAMPLING_RATE, i*0.2)
-        gamma_signal = generate_band_signal(GAMMA_FREQ, gamma_amp, 1/SAMPLING_RATE, i*0.3)
-        
-        amplitude = theta_signal + alpha_signal + beta_signal + gamma_signal
-        amplitude = add_noise(np.array([amplitude]), noise_level=5.0)[0]
-        amplitude = float(amplitude)
-        
-        # Calculate normalized band powers
-        total_power = theta_amp + alpha_amp + beta_amp + gamma_amp
-        theta_power = theta_amp / total_power
-        alpha_power = alpha_amp / total_power
-        beta_power = beta_amp / total_power
-        gamma_power = gamma_amp / total_power
-        
-        # Command detection
-        if beta_power > 0.6:
-            command = "FOCUS"
-        elif alpha_power > 0.6:
-            command = "RELAX"
-        else:
-            command = "NONE"
-        
-        data.append({
-            'time': round(time, 3),
-            'amplitude': round(amplitude, 2),
-            'theta_power': round(theta_power, 2),
-            'alpha_power': round(alpha_power, 2),
-            'beta_power': round(beta_power, 2),
-            'gamma_power': round(gamma_power, 2),
-            'command': command,
-            'attention_deficit': attention_status
-        })
-    
-    return pd.DataFrame(data)
+def generate_datasets(sampling_rate=SAMPLING_RATE, duration=DURATION):
+    """Generate all three datasets in one pass, in DATASETS order.
+
+    The time axis and sine basis are shared, so the three composite signals
+    come from a single (dataset, sample, band) x (band, sample) contraction.
+    """
+    for title, _, _, _ in DATASETS:
+        print(f"📊 Generating {title} Dataset...")
+    
+    n = np.arange(int(sampling_rate * duration))
+    t = np.round(n.astype(np.float32) / sampling_rate, 3)
+    window = np.searchsorted(WINDOW_ENDS * sampling_rate, n, side='right')
+    
+    amps = np.stack([table for _, _, _, table in DATASETS])[:, window]
+    signals = np.einsum('dnk,kn->dn', amps, band_basis(len(n), sampling_rate))
+    signals += rng.standard_normal(signals.shape, dtype=np.float32) * np.float32(5.0)
+    status = WINDOW_STATUS[window]
+    
+    return [build_dataset(t, amps[d], signals[d], column, status)
+            for d, (_, column, _, _) in enumerate(DATASETS)]
 
 def main():
+    args = parse_args(__doc__.strip().splitlines()[0], "data/raw",
+                      "Output directory (default: %(default)s)")
+    paths = [os.path.join(args.out, os.path.splitext(name)[0] + '.' + args.format)
+             for _, _, name, _ in DATASETS]
+    params = generation_params(args)
+    if not args.force and all(is_up_to_date(path, __file__, params) for path in paths):
+        print(f"✅ Datasets in {args.out} are up to date (use --force to regenerate)")
+        return
+    
+    num_samples = int(args.sampling_rate * args.duration)
     print("🧠 Generating Separate EEG Datasets for Each Prediction Type...")
-    print(f"📊 Parameters: {SAMPLING_RATE}Hz, {DURATION}s, {NUM_SAMPLES} samples each\n")
+    print(f"📊 Parameters: {args.sampling_rate}Hz, {args.duration:g}s, {num_samples} samples each\n")
     
     # Ensure directory exists
-    os.makedirs("data/raw", exist_ok=True)
-    
-    # Generate and save visual impairment dataset
-    df_visual = generate_visual_impairment_dataset()
-    visual_path = "data/raw/visual_impairment_data.csv"
-    df_visual.to_csv(visual_path, index=False)
-    print(f"✅ Visual Impairment Dataset: {len(df_visual)} samples")
-    print(f"   Saved to: {visual_path}")
-    print(f"   Columns: {list(df_visual.columns)}\n")
-    
-    # Generate and save motor impairment dataset
-    df_motor = generate_motor_impairment_dataset()
-    motor_path = "data/raw/motor_impairment_data.csv"
-    df_motor.to_csv(motor_path, index=False)
-    print(f"✅ Motor Impairment Dataset: {len(df_motor)} samples")
-    print(f"   Saved to: {motor_path}")
-    print(f"   Columns: {list(df_motor.columns)}\n")
-    
-    # Generate and save attention deficit dataset
-    df_attention = generate_attention_deficit_dataset()
-    attention_path = "data/raw/attention_deficit_data.csv"
-    df_attention.to_csv(attention_path, index=False)
-    print(f"✅ Attention Deficit Dataset: {len(df_attention)} samples")
-    print(f"   Saved to: {attention_path}")
-    print(f"   Columns: {list(df_attention.columns)}\n")
+    os.makedirs(args.out, exist_ok=True)
+    
+    # Generate all three datasets, then save them
+    frames = generate_datasets(args.sampling_rate, args.duration)
+    paths = [save_dataset(df, path, args.format) for df, path in zip(frames, paths)]
+    for path in paths:
+        record_params(path, params)
+    
+    for (title, _, _, _), df, path in zip(DATASETS, frames, paths):
+        print(f"✅ {title} Dataset: {len(df)} samples")
+        print(f"   Saved to: {path}")
+        print(f"   Columns: {list(df.columns)}\n")
     
     # Print summary
     print("=" * 60)
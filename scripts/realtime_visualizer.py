@@ -8,27 +8,73 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.gridspec import GridSpec
-from scipy.fft import fft, fftfreq
+from matplotlib.collections import PolyCollection
+from scipy.fft import rfft, rfftfreq
+from scipy.signal import welch
+from scipy.signal.windows import hann
 import queue
+import threading
 import time
 
-class BCIVisualizer:
+from viz_common import RENDER_PARAMS, VisualizerHelpers
+
+class BCIVisualizer(VisualizerHelpers):
     def __init__(self):
         # Configuration
         self.sampling_rate = 256
         self.window_size = 256
         self.display_seconds = 3
         self.update_interval = 50
+        self.display_pixels = 600  # Waveform width in pixels, re-measured from the axes
         
-        # Data buffers
-        from collections import deque
+        # Data buffers: rings with _head as the next write slot. Each sample is written
+        # twice (i and i + max_points) so the newest ones are always one contiguous slice
         self.max_points = int(self.sampling_rate * self.display_seconds)
-        self.time_data = deque(maxlen=self.max_points)
-        self.signal_data = deque(maxlen=self.max_points)
-        self.theta_power_history = deque(maxlen=100)
-        self.alpha_power_history = deque(maxlen=100)
-        self.beta_power_history = deque(maxlen=100)
-        self.gamma_power_history = deque(maxlen=100)
+        self._sig_buf = np.empty(2 * self.max_points, np.float32)
+        self._t_buf = np.empty(2 * self.max_points, np.float64)
+        self._head = 0
+        self._count = 0
+        self._samples_seen = 0  # Total ever written (unlike _count, never saturates)
+        
+        # Running min/max, rescanned only after an extreme is overwritten
+        self._y_min = np.inf
+        self._y_max = -np.inf
+        self._yrange_stale = False
+        
+        # Band power history (rows: theta, alpha, beta, gamma)
+        self.history_size = 100
+        self._power_buf = np.empty((4, self.history_size), np.float32)
+        self._power_head = 0
+        self._power_count = 0
+        
+        # FFT bins up to 50 Hz
+        self._freqs = rfftfreq(self.window_size, 1.0 / self.sampling_rate).astype(np.float32)
+        self._fft_cutoff = np.searchsorted(self._freqs, 50.0, side='right')
+        self._freqs_trim = self._freqs[:self._fft_cutoff]
+        
+        # Hann taper, scaled to unit mean so peak heights match the raw FFT
+        self._hann = hann(self.window_size, sym=False).astype(np.float32)
+        self._hann /= self._hann.mean()
+        self._fft_in = np.empty(self.window_size, np.float32)
+        self._spec_buf = np.empty(self._fft_cutoff, np.float32)
+        
+        # Newest spectrum from the consumer thread, and its version
+        self._spec_latest = np.zeros(self._fft_cutoff, np.float32)
+        self._spec_version = 0
+        self._spec_drawn = 0
+        
+        # Recompute the spectrum every quarter window of samples (and no faster in real time)
+        self.fft_hop = self.window_size // 4
+        self._last_fft_at = -self.fft_hop
+        self._last_fft_time = 0.0
+        
+        # Welch band powers: half-window Hann segments, theta/alpha/beta/gamma start bins
+        self.welch_nperseg = self.window_size // 2
+        self._welch_window = hann(self.welch_nperseg, sym=False)
+        welch_freqs = rfftfreq(self.welch_nperseg, 1.0 / self.sampling_rate)
+        self._welch_cutoff = np.searchsorted(welch_freqs, 50.0, side='right')
+        self._band_starts = np.searchsorted(welch_freqs, (4.0, 8.0, 13.0, 30.0))
+        self.powers_from_fft = True  # Cleared once a producer sends its own band powers
         
         # Current state
         self.current_command = "NONE"
@@ -46,15 +92,42 @@ class BCIVisualizer:
         # Dataset tracking
         self.dataset_name = "General"  # Can be set externally
         
-        # Data queue
-        self.data_queue = queue.Queue()
+        # Data queue, drained by a consumer thread; _lock guards the buffers
+        self.data_queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        
+        # Display colors, and the last text/color shown by each Text artist
+        self.pred_colors = {'NORMAL': '#00aa00', 'BORDERLINE': '#cc8800', 'IMPAIRED': '#cc0000'}
+        self.cmd_colors = {'FOCUS': '#00aa00', 'RELAX': '#0088cc', 'BLINK': '#cc6600', 'NONE': '#666666'}
+        self._last_text = {}
+        self._bar_widths = {}
+        self._status_state = None
+        
+        # Animation driving update_plot (set by the caller) and smoothed frame cost
+        self.anim = None
+        self._ema_frame_ms = 0.0
+        
+        # Slower interval (ms) while the window is minimized or otherwise unmapped
+        self.hidden_interval = 500
+        self._window_hidden = False
         
         # Setup figure
         self.setup_figure()
+        self._watch_window()
+        
+        self._consumer = threading.Thread(target=self._consume, daemon=True)
+        self._consumer.start()
+        
+        # Artists redrawn on every blitted frame (health labels are background)
+        self._animated = (self.line_waveform, self.line_spectrum, self.fill_spectrum,
+                          self.bar_theta[0], self.bar_alpha[0], self.bar_beta[0], self.bar_gamma[0],
+                          self.text_theta, self.text_alpha, self.text_beta, self.text_gamma,
+                          *self.text_elements.values())
         
     def setup_figure(self):
         """Create the BCI interface"""
         # WHITE background
+        plt.rcParams.update(RENDER_PARAMS)
         self.fig = plt.figure(figsize=(12, 8), facecolor='white')
         
         # Set window title - will be updated if dataset_name is set
@@ -115,9 +188,14 @@ class BCIVisualizer:
             spine.set_edgecolor('white')
             spine.set_linewidth(2)
         
-        self.line_waveform, = self.ax_waveform.plot([], [], color='#00ff00', linewidth=1.0)
+        self.line_waveform, = self.ax_waveform.plot([], [], color='#00ff00', linewidth=1.0,
+                                                    antialiased=False, solid_joinstyle='miter',
+                                                    solid_capstyle='butt')
         self.ax_waveform.set_xlim(0, self.display_seconds)
         self.ax_waveform.set_ylim(-10, 10)
+        # Cached axis limits
+        self._x_right = float(self.display_seconds)
+        self._last_ylim = (-10.0, 10.0)
         
     def setup_spectrum_plot(self):
         """Setup spectrum with BLACK axis text"""
@@ -138,7 +216,19 @@ class BCIVisualizer:
         
         self.ax_spectrum.axvspan(8, 13, alpha=0.1, color='yellow')
         self.ax_spectrum.axvspan(13, 30, alpha=0.1, color='cyan')
-        self.line_spectrum, = self.ax_spectrum.plot([], [], color='#00ffff', linewidth=1.5)
+        # Fixed bins; each FFT only replaces y
+        self.line_spectrum, = self.ax_spectrum.plot(self._freqs_trim, np.full(self._fft_cutoff, np.nan),
+                                                    color='#00ffff', linewidth=1.5, antialiased=False,
+                                                    solid_joinstyle='miter', solid_capstyle='butt')
+        
+        # Shaded area under the spectrum, updated in place
+        self._spec_verts = np.zeros((len(self._freqs_trim) + 2, 2), np.float32)
+        self._spec_verts[1:-1, 0] = self._freqs_trim
+        self._spec_verts[0, 0] = self._freqs_trim[0]
+        self._spec_verts[-1, 0] = self._freqs_trim[-1]
+        self.fill_spectrum = PolyCollection([self._spec_verts], facecolor='#00ffff',
+                                            edgecolor='none', alpha=0.3)
+        self.ax_spectrum.add_collection(self.fill_spectrum)
         
     def setup_feature_blocks(self):
         """Setup 4 band power blocks with dataset-specific emphasis"""
@@ -322,106 +412,177 @@ class BCIVisualizer:
                                          color='#333333'),
         }
     
+    def _y_range(self):
+        """Min and max of the buffered signal"""
+        if self._yrange_stale:
+            valid = self._sig_buf[:self._count]
+            self._y_min, self._y_max = float(valid.min()), float(valid.max())
+            self._yrange_stale = False
+        return self._y_min, self._y_max
+    
     def compute_fft(self, signal_data):
-        """Compute FFT"""
-        n = len(signal_data)
-        if n < self.window_size:
-            return None, None
+        """Compute the magnitude spectrum (0-50 Hz) of the last window.
         
-        signal_arr = np.array(signal_data)
-        yf = np.abs(fft(signal_arr[-self.window_size:]))
-        xf = fftfreq(self.window_size, 1/self.sampling_rate)
+        The returned arrays are reused by the next call; copy them to keep them.
+        """
+        if len(signal_data) < self.window_size:
+            return None, None
         
-        mask = (xf >= 0) & (xf <= 50)
-        return xf[mask], yf[mask]
+        # Taper a private copy of the window, which rfft may then overwrite
+        np.multiply(signal_data[-self.window_size:], self._hann, out=self._fft_in)
+        np.abs(rfft(self._fft_in, overwrite_x=True)[:self._fft_cutoff], out=self._spec_buf)
+        return self._freqs_trim, self._spec_buf
+    
+    def decimate(self, t, y):
+        """Reduce a waveform to a min/max pair per display column once it is over 4 samples per pixel"""
+        n = len(y)
+        if n <= 4 * self.display_pixels:
+            return t, y
+        stride = n // self.display_pixels
+        start = n % stride  # Drop the oldest few samples so the blocks divide evenly
+        y_blocks = y[start:].reshape(-1, stride)
+        t_blocks = t[start:].reshape(-1, stride)
+        t_out = np.empty(2 * len(y_blocks), t.dtype)
+        y_out = np.empty(2 * len(y_blocks), y.dtype)
+        t_out[0::2], t_out[1::2] = t_blocks[:, 0], t_blocks[:, -1]
+        y_out[0::2], y_out[1::2] = y_blocks.min(axis=1), y_blocks.max(axis=1)
+        return t_out, y_out
+    
+    def band_powers(self, signal_data):
+        """Relative theta/alpha/beta/gamma power of the last window (Welch PSD)"""
+        _, psd = welch(signal_data[-self.window_size:], fs=self.sampling_rate,
+                       window=self._welch_window, noverlap=self.welch_nperseg // 2, detrend=False)
+        power = np.add.reduceat(psd[:self._welch_cutoff], self._band_starts)
+        total = power.sum()
+        if total <= 0:
+            return 0.25, 0.25, 0.25, 0.25
+        return tuple((power / total).tolist())
+    
+    def _watch_window(self):
+        """Follow the figure window being hidden or shown, on backends that report it (Tk, Qt)"""
+        window = getattr(self.fig.canvas.manager, 'window', None)
+        if window is None:
+            return  # Non-interactive backend, nothing to hide
+        if hasattr(window, 'bind'):  # Tk toplevel; child widgets' events also reach it
+            window.bind('<Unmap>', lambda event: event.widget == window and self._set_hidden(True), '+')
+            window.bind('<Map>', lambda event: event.widget == window and self._set_hidden(False), '+')
+        elif hasattr(window, 'installEventFilter'):  # Qt main window
+            from matplotlib.backends.qt_compat import QtCore
+            # Qt6 bindings scope the members under QEvent.Type; PyQt5 keeps them on QEvent
+            event_type = getattr(QtCore.QEvent, 'Type', QtCore.QEvent)
+            if not hasattr(event_type, 'Hide'):
+                event_type = QtCore.QEvent
+            events = (event_type.Hide, event_type.Show, event_type.WindowStateChange)
+            
+            class VisibilityFilter(QtCore.QObject):
+                def eventFilter(filt, obj, event):
+                    if event.type() in events:
+                        self._set_hidden(obj.isMinimized() or not obj.isVisible())
+                    return False
+            
+            self._visibility_filter = VisibilityFilter(window)
+            window.installEventFilter(self._visibility_filter)
+    
+    def _set_hidden(self, hidden):
+        """Drop to hidden_interval while the window cannot be seen, and back when it can"""
+        if hidden == self._window_hidden:
+            return
+        self._window_hidden = hidden
+        if self.anim is not None:
+            self.anim.event_source.interval = self.hidden_interval if hidden else self.update_interval
     
     def update_plot(self, frame):
         """Update all plots"""
-        # Process queue
-        points_processed = 0
-        try:
-            while not self.data_queue.empty() and points_processed < 50:
-                data = self.data_queue.get_nowait()
-                self.process_data(data)
-                points_processed += 1
-        except queue.Empty:
-            pass
-        
-        artists = []
+        start = time.perf_counter()
+        # Snapshot the buffers; the consumer thread keeps writing while we draw
+        with self._lock:
+            count = self._count
+            if count > 0:
+                end = self._head + self.max_points
+                t_data = self._t_buf[end - count:end].copy()
+                y_data = self._sig_buf[end - count:end].copy()
+                y_min, y_max = self._y_range()
+            spec_new = self._spec_version != self._spec_drawn
+            if spec_new:
+                self._spec_drawn = self._spec_version
+                yf = self._spec_latest.copy()
+        
+        # Limit changes live in the blit background and need a full draw
+        redraw = False
         
         # Update waveform
-        if len(self.time_data) > 0:
-            t_data = list(self.time_data)
-            y_data = list(self.signal_data)
+        if count > 0:
+            # Scroll in quarter-window steps
+            if t_data[-1] > self._x_right:
+                self._x_right = float(t_data[-1]) + self.display_seconds / 4
+                self.ax_waveform.set_xlim(self._x_right - self.display_seconds, self._x_right)
+                redraw = True
             
-            if t_data[-1] > self.ax_waveform.get_xlim()[1]:
-                 self.ax_waveform.set_xlim(t_data[-1] - self.display_seconds, t_data[-1])
-            
-            if frame % 10 == 0 and len(y_data) > 0:
-                y_min, y_max = min(y_data), max(y_data)
-                padding = max(10, (y_max - y_min) * 0.1)
-                self.ax_waveform.set_ylim(y_min - padding, y_max + padding)
+            # Rescale only when the signal outgrows or underfills the axes
+            padding = max(10, (y_max - y_min) * 0.1)
+            lo, hi = y_min - padding, y_max + padding
+            cur_lo, cur_hi = self._last_ylim
+            if y_min < cur_lo or y_max > cur_hi or (hi - lo) < 0.8 * (cur_hi - cur_lo):
+                self.ax_waveform.set_ylim(lo, hi)
+                self._last_ylim = (lo, hi)
+                redraw = True
                  
-            self.line_waveform.set_data(t_data, y_data)
-            artists.append(self.line_waveform)
-        
-        # Update FFT
-        if frame % 5 == 0 and len(self.signal_data) >= self.window_size:
-            xf, yf = self.compute_fft(self.signal_data)
-            if xf is not None:
-                self.line_spectrum.set_data(xf, yf)
-                artists.append(self.line_spectrum)
-        else:
-            artists.append(self.line_spectrum)
-        
-        # Update bands
-        if len(self.alpha_power_history) > 0:
-            self.bar_theta[0].set_width(self.current_theta)
-            self.text_theta.set_text(f'{self.current_theta:.2f}')
-            
-            self.bar_alpha[0].set_width(self.current_alpha)
-            self.text_alpha.set_text(f'{self.current_alpha:.2f}')
-            
-            self.bar_beta[0].set_width(self.current_beta)
-            self.text_beta.set_text(f'{self.current_beta:.2f}')
-            
-            self.bar_gamma[0].set_width(self.current_gamma)
-            self.text_gamma.set_text(f'{self.current_gamma:.2f}')
+            # Track the axes' pixel width
+            if frame % 30 == 0:
+                self.display_pixels = max(1, int(self.ax_waveform.bbox.width))
+            self.line_waveform.set_data(*self.decimate(t_data, y_data))
+        
+        # Update FFT (computed by the consumer thread)
+        if spec_new:
+            self.line_spectrum.set_ydata(yf)
+            self._spec_verts[1:-1, 1] = yf
+            self.fill_spectrum.set_verts([self._spec_verts])
+        
+        # Update bands (bars move only on a visible change)
+        if self._power_count > 0:
+            bands = (('theta', self.bar_theta[0], self.text_theta, self.current_theta),
+                     ('alpha', self.bar_alpha[0], self.text_alpha, self.current_alpha),
+                     ('beta', self.bar_beta[0], self.text_beta, self.current_beta),
+                     ('gamma', self.bar_gamma[0], self.text_gamma, self.current_gamma))
+            for key, bar, text, value in bands:
+                if abs(value - self._bar_widths.get(key, -1.0)) > 0.005:
+                    bar.set_width(value)
+                    self._bar_widths[key] = value
+                self._set_text(key, text, f'{value:.2f}')
         
         # Update health predictions
-        pred_colors = {'NORMAL': '#00aa00', 'BORDERLINE': '#cc8800', 'IMPAIRED': '#cc0000'}
-        
-        if 'visual' in self.health_texts:
-            self.health_texts['visual'].set_text(f'Visual: {self.visual_impairment}')
-            self.health_texts['visual'].set_color(pred_colors.get(self.visual_impairment, '#333333'))
-            self.health_texts['visual'].get_bbox_patch().set_edgecolor(pred_colors.get(self.visual_impairment, '#999999'))
-        
-        if 'motor' in self.health_texts:
-            self.health_texts['motor'].set_text(f'Motor: {self.motor_impairment}')
-            self.health_texts['motor'].set_color(pred_colors.get(self.motor_impairment, '#333333'))
-            self.health_texts['motor'].get_bbox_patch().set_edgecolor(pred_colors.get(self.motor_impairment, '#999999'))
-        
-        if 'attention' in self.health_texts:
-            self.health_texts['attention'].set_text(f'Attention: {self.attention_deficit}')
-            self.health_texts['attention'].set_color(pred_colors.get(self.attention_deficit, '#333333'))
-            self.health_texts['attention'].get_bbox_patch().set_edgecolor(pred_colors.get(self.attention_deficit, '#999999'))
+        predictions = {'visual': ('Visual', self.visual_impairment),
+                       'motor': ('Motor', self.motor_impairment),
+                       'attention': ('Attention', self.attention_deficit)}
+        for key, text in self.health_texts.items():
+            label, status = predictions[key]
+            if self._set_text(key, text, f'{label}: {status}', self.pred_colors.get(status, '#333333')):
+                text.get_bbox_patch().set_edgecolor(self.pred_colors.get(status, '#999999'))
+                redraw = True
         
         # Update status
         self.update_status_panel()
-        artists.extend(self.text_elements.values())
         
-        return artists
+        if redraw:
+            self.fig.canvas.draw()
+        self._pace_frames(start)
+        return self._animated
     
     def update_status_panel(self):
         """Update status text"""
-        cmd_colors = {'FOCUS': '#00aa00', 'RELAX': '#0088cc', 'BLINK': '#cc6600', 'NONE': '#666666'}
+        # Skip if nothing shown changed
+        state = (self.current_command, self.led_state, self.current_theta, self.current_alpha,
+                 self.current_beta, self.current_gamma, self.dataset_name)
+        if state == self._status_state:
+            return
+        self._status_state = state
         
-        self.text_elements['command'].set_text(f'Command:\n{self.current_command}')
-        self.text_elements['command'].set_color(cmd_colors.get(self.current_command, '#333333'))
+        self._set_text('command', self.text_elements['command'], f'Command:\n{self.current_command}',
+                       self.cmd_colors.get(self.current_command, '#333333'))
         
         led_text = 'LED: ON' if self.led_state else 'LED: OFF'
-        self.text_elements['led'].set_text(led_text)
-        self.text_elements['led'].set_color('#00aa00' if self.led_state else '#cc0000')
+        self._set_text('led', self.text_elements['led'], led_text,
+                       '#00aa00' if self.led_state else '#cc0000')
         
         # Customize stats based on dataset
         stats_text = f'θ:{self.current_theta:.2f}\nα:{self.current_alpha:.2f}\nβ:{self.current_beta:.2f}\nγ:{self.current_gamma:.2f}'
@@ -431,28 +592,112 @@ class BCIVisualizer:
             theta_beta_ratio = self.current_theta / self.current_beta if self.current_beta > 0.01 else 10.0
             stats_text += f'\n\nθ/β Ratio:\n{theta_beta_ratio:.2f}'
         
-        self.text_elements['stats'].set_text(stats_text)
-        self.text_elements['stats'].set_color('#333333')
+        self._set_text('stats', self.text_elements['stats'], stats_text)
     
-    def process_data(self, data):
-        """Process incoming data"""
-        self.time_data.append(data['time'])
-        self.signal_data.append(data['amplitude'])
+    def _consume(self):
+        """Consumer thread: block until data arrives, apply everything queued as one batch,
+        then refresh the spectrum if a hop of new samples has arrived"""
+        while True:
+            batch = [self.data_queue.get()]
+            try:
+                while True:
+                    batch.append(self.data_queue.get_nowait())
+            except queue.Empty:
+                pass
+            with self._lock:
+                self.process_batch(batch)
+                window = self._fft_window()
+            if window is not None:
+                self._analyze(window)
+    
+    def _fft_window(self):
+        """Copy of the newest window if a spectrum update is due, else None (call with _lock held)"""
+        now = time.perf_counter()
+        if (self._count < self.window_size or self._samples_seen - self._last_fft_at < self.fft_hop or
+                now - self._last_fft_time < self.fft_hop / self.sampling_rate):
+            return None
+        self._last_fft_at = self._samples_seen
+        self._last_fft_time = now
+        end = self._head + self.max_points
+        return self._sig_buf[end - self.window_size:end].copy()
+    
+    def _analyze(self, window):
+        """Spectrum and band powers of one window, computed outside the lock and then published"""
+        _, yf = self.compute_fft(window)
+        powers = self.band_powers(window) if self.powers_from_fft else None
+        with self._lock:
+            self._spec_latest[:] = yf
+            self._spec_version += 1
+            # A producer may have started sending band powers while we computed
+            if powers is not None and self.powers_from_fft:
+                (self.current_theta, self.current_alpha,
+                 self.current_beta, self.current_gamma) = powers
+                self._record_powers()
+    
+    def push_samples(self, t, y):
+        """Write arrays of timestamps and amplitudes into the ring buffers (at most two slice copies each)"""
+        t = np.asarray(t, np.float64)
+        y = np.asarray(y, np.float32)
+        n = len(y)
+        self._samples_seen += n
+        if n > self.max_points:
+            t, y, n = t[-self.max_points:], y[-self.max_points:], self.max_points
+        i = self._head
+        first = min(n, self.max_points - i)
+        
+        # Samples about to be overwritten; if one was an extreme, rescan lazily
+        old = self._sig_buf[:n - first]
+        if self._count == self.max_points:
+            old = np.concatenate((self._sig_buf[i:i + first], old))
+        if old.size and (old.min() <= self._y_min or old.max() >= self._y_max):
+            self._yrange_stale = True
+        self._y_min = min(self._y_min, float(y.min()))
+        self._y_max = max(self._y_max, float(y.max()))
+        
+        for buf, values in ((self._sig_buf, y), (self._t_buf, t)):
+            for base in (0, self.max_points):
+                buf[base + i:base + i + first] = values[:first]
+                buf[base:base + n - first] = values[first:]
+        self._head = (i + n) % self.max_points
+        self._count = min(self._count + n, self.max_points)
+    
+    def process_batch(self, batch):
+        """Process a list of incoming dicts; state comes from the last one.
+        
+        Items are either single samples (scalar 'time'/'amplitude') or chunks
+        whose 'time'/'amplitude' are arrays; a producer sends one kind only.
+        """
+        if isinstance(batch[0]['amplitude'], np.ndarray):
+            self.push_samples(np.concatenate([d['time'] for d in batch]),
+                              np.concatenate([d['amplitude'] for d in batch]))
+        else:
+            self.push_samples(np.fromiter((d['time'] for d in batch), np.float64, len(batch)),
+                              np.fromiter((d['amplitude'] for d in batch), np.float32, len(batch)))
         
+        data = batch[-1]
         if 'command' in data: self.current_command = data['command']
-        if 'theta_power' in data: 
-            self.current_theta = data['theta_power']
-            self.theta_power_history.append(data['theta_power'])
-        if 'alpha_power' in data: 
-            self.current_alpha = data['alpha_power']
-            self.alpha_power_history.append(data['alpha_power'])
-        if 'beta_power' in data: 
-            self.current_beta = data['beta_power']
-            self.beta_power_history.append(data['beta_power'])
-        if 'gamma_power' in data: 
-            self.current_gamma = data['gamma_power']
-            self.gamma_power_history.append(data['gamma_power'])
+        if 'theta_power' in data: self.current_theta = data['theta_power']
+        if 'alpha_power' in data: self.current_alpha = data['alpha_power']
+        if 'beta_power' in data: self.current_beta = data['beta_power']
+        if 'gamma_power' in data: self.current_gamma = data['gamma_power']
         if 'led_state' in data: self.led_state = data['led_state']
         if 'visual_impairment' in data: self.visual_impairment = data['visual_impairment']
         if 'motor_impairment' in data: self.motor_impairment = data['motor_impairment']
         if 'attention_deficit' in data: self.attention_deficit = data['attention_deficit']
+        
+        # Supplied band powers take precedence over the FFT estimate
+        if any(key in data for key in ('theta_power', 'alpha_power', 'beta_power', 'gamma_power')):
+            self.powers_from_fft = False
+            self._record_powers()
+    
+    def _record_powers(self):
+        """Append the current band powers to the history ring"""
+        j = self._power_head
+        self._power_buf[:, j] = (self.current_theta, self.current_alpha,
+                                 self.current_beta, self.current_gamma)
+        self._power_head = (j + 1) % self.history_size
+        self._power_count = min(self._power_count + 1, self.history_size)
+    
+    def process_data(self, data):
+        """Process a single incoming sample dict"""
+        self.process_batch([data])
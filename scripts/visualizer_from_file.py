@@ -69,6 +69,8 @@ print(f"Dataset Type: {dataset_type}")
 try:
     if filepath.endswith('.xlsx') or filepath.endswith('.xls'):
         df = pd.read_excel(filepath)
+    elif filepath.endswith('.parquet'):
+        df = pd.read_parquet(filepath)
     else:  # CSV
         df = pd.read_csv(filepath)
     
@@ -85,7 +87,7 @@ for col in required:
     if col not in df.columns:
         print(f"ERROR: Missing required column '{col}'")
         print(f"Required columns: {required}")
-        print(f"Optional columns: alpha_power, beta_power, command")
+        print(f"Optional columns: theta_power, alpha_power, beta_power, gamma_power, command")
         sys.exit(1)
 
 # Create visualizer
@@ -93,40 +95,64 @@ vis = BCIVisualizer()
 # Store dataset type for display
 vis.dataset_name = dataset_type
 
+# Playback speed (rows per second); rows are queued in one chunk per animation frame
+PLAYBACK_RATE = 100
+CHUNK_SIZE = max(1, PLAYBACK_RATE * vis.update_interval // 1000)
+
+def column(name, default):
+    """Column as a NumPy array, or a constant array if the file lacks it"""
+    if name in df.columns:
+        return df[name].to_numpy()
+    return np.full(len(df), default, dtype=object if isinstance(default, str) else float)
+
+def impaired(name):
+    return np.isin(column(name, 'NORMAL'), ['IMPAIRED', 'BORDERLINE'])
+
 # Feed data from file
 def load_file_data():
-    for _, row in df.iterrows():
-        # Determine LED state based on impairment detection (not just FOCUS command)
-        # LED ON = Warning indicator for impairment
-        led_on = False
-        if dataset_type == "Visual Impairment":
-            led_on = row.get('visual_impairment', 'NORMAL') in ['IMPAIRED', 'BORDERLINE']
-        elif dataset_type == "Motor Impairment":
-            led_on = row.get('motor_impairment', 'NORMAL') in ['IMPAIRED', 'BORDERLINE']
-        elif dataset_type == "Attention Deficit":
-            led_on = row.get('attention_deficit', 'NORMAL') in ['IMPAIRED', 'BORDERLINE']
-        else:
-            # For general dataset, check any impairment
-            led_on = (row.get('command', 'NONE') == 'FOCUS' or
-                     row.get('visual_impairment', 'NORMAL') != 'NORMAL' or
-                     row.get('motor_impairment', 'NORMAL') != 'NORMAL' or
-                     row.get('attention_deficit', 'NORMAL') != 'NORMAL')
+    # Determine LED state based on impairment detection (not just FOCUS command)
+    # LED ON = Warning indicator for impairment
+    if dataset_type == "Visual Impairment":
+        led = impaired('visual_impairment')
+    elif dataset_type == "Motor Impairment":
+        led = impaired('motor_impairment')
+    elif dataset_type == "Attention Deficit":
+        led = impaired('attention_deficit')
+    else:
+        # For general dataset, check any impairment
+        led = ((column('command', 'NONE') == 'FOCUS') |
+               (column('visual_impairment', 'NORMAL') != 'NORMAL') |
+               (column('motor_impairment', 'NORMAL') != 'NORMAL') |
+               (column('attention_deficit', 'NORMAL') != 'NORMAL'))
+    
+    times = df['time'].to_numpy(np.float64)
+    amplitudes = df['amplitude'].to_numpy(np.float32)
+    state = {
+        'command': column('command', 'NONE'),
+        'led_state': led,
+        'visual_impairment': column('visual_impairment', 'NORMAL'),
+        'motor_impairment': column('motor_impairment', 'NORMAL'),
+        'attention_deficit': column('attention_deficit', 'NORMAL')
+    }
+    # Band powers missing from the file are estimated from the spectrum by the visualizer
+    for name in ('theta_power', 'alpha_power', 'beta_power', 'gamma_power'):
+        if name in df.columns:
+            state[name] = df[name].to_numpy()
+    
+    # One queue item per chunk: sample arrays plus the state of its last row
+    deadline = time.perf_counter()
+    for start in range(0, len(df), CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, len(df))
+        chunk = {key: values[stop - 1] for key, values in state.items()}
+        chunk['time'] = times[start:stop]
+        chunk['amplitude'] = amplitudes[start:stop]
+        vis.data_queue.put(chunk)
         
-        data = {
-            'time': row['time'],
-            'amplitude': row['amplitude'],
-            'command': row.get('command', 'NONE'),
-            'theta_power': row.get('theta_power', 0.25),
-            'alpha_power': row.get('alpha_power', 0.25),
-            'beta_power': row.get('beta_power', 0.25),
-            'gamma_power': row.get('gamma_power', 0.25),
-            'led_state': led_on,
-            'visual_impairment': row.get('visual_impairment', 'NORMAL'),
-            'motor_impairment': row.get('motor_impairment', 'NORMAL'),
-            'attention_deficit': row.get('attention_deficit', 'NORMAL')
-        }
-        vis.data_queue.put(data)
-        time.sleep(0.01)  # Slow playback
+        # Sleep to an absolute deadline so playback does not drift
+        deadline += (stop - start) / PLAYBACK_RATE
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
     
     print(f"\n✓ {dataset_type} data loaded!")
     print("Visualization showing how input is processed → output")
@@ -139,7 +165,8 @@ thread.start()
 # Setup animation
 anim = animation.FuncAnimation(vis.fig, vis.update_plot, 
                               interval=vis.update_interval, 
-                              blit=False, cache_frame_data=False)
+                              blit=True, cache_frame_data=False)
+vis.anim = anim
 
 print("\\n📊 Starting visualization...")
 print("Watch how the EEG data is processed and classified!")
@@ -11,14 +11,16 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.gridspec import GridSpec
 from matplotlib.widgets import Button
-from scipy.fft import fft, fftfreq
+from scipy.fft import rfft, rfftfreq
 import queue
 import time
 from collections import deque
 from datetime import datetime
 import csv
 
-class VisualImpairmentVisualizer:
+from viz_common import VisualizerHelpers
+
+class VisualImpairmentVisualizer(VisualizerHelpers):
     def __init__(self):
         # Configuration
         self.sampling_rate = 256
@@ -30,7 +32,14 @@ class VisualImpairmentVisualizer:
         self.max_points = int(self.sampling_rate * self.display_seconds)
         self.time_data = deque(maxlen=self.max_points)
         self.signal_data = deque(maxlen=self.max_points)
-        self.alpha_power_history = deque(maxlen=100)
+        self.alpha_power_history = np.zeros(100, np.float32)  # Ring buffer; _alpha_count counts writes
+        self._alpha_count = 0
+        
+        # FFT bins up to 50 Hz
+        self._xf = rfftfreq(self.window_size, 1/self.sampling_rate)
+        self._fft_cutoff = int(np.searchsorted(self._xf, 50, 'right'))
+        self._xf_masked = self._xf[:self._fft_cutoff]
+        self._yf_buf = np.empty(len(self._xf), dtype=np.float32)
         
         # Current state
         self.current_command = "NONE"
@@ -47,11 +56,19 @@ class VisualImpairmentVisualizer:
         self.total_samples = 0
         
         # Data queue
-        self.data_queue = queue.Queue()
+        self.data_queue = queue.SimpleQueue()
+        
+        # Last text/color per artist, and bar widths
+        self._last_text = {}
+        self._bar_widths = {}
         
         # Setup figure
         self.setup_figure()
         
+        # Artists redrawn on every blitted frame (the health label is background)
+        self._animated = (self.line_waveform, self.line_spectrum, self.bar_alpha[0], self.text_alpha,
+                          *self.text_elements.values())
+        
     def setup_figure(self):
         """Create the BCI interface"""
         # WHITE background
@@ -109,6 +126,9 @@ class VisualImpairmentVisualizer:
         self.line_waveform, = self.ax_waveform.plot([], [], color='#00ff00', linewidth=1.0)
         self.ax_waveform.set_xlim(0, self.display_seconds)
         self.ax_waveform.set_ylim(-10, 10)
+        # Cached axis limits
+        self._x_right = float(self.display_seconds)
+        self._last_ylim = (-10.0, 10.0)
         
     def setup_spectrum_plot(self):
         """Setup spectrum with BLACK axis text"""
@@ -128,7 +148,8 @@ class VisualImpairmentVisualizer:
             spine.set_linewidth(2)
         
         self.ax_spectrum.axvspan(8, 13, alpha=0.15, color='yellow')
-        self.line_spectrum, = self.ax_spectrum.plot([], [], color='#00ffff', linewidth=1.5)
+        self.line_spectrum, = self.ax_spectrum.plot(self._xf_masked, np.full(self._fft_cutoff, np.nan),
+                                                    color='#00ffff', linewidth=1.5)
         
     def setup_feature_blocks(self):
         """Setup ONLY Alpha band - PRIMARY focus for visual impairment"""
@@ -184,97 +205,109 @@ class VisualImpairmentVisualizer:
         if n < self.window_size:
             return None, None
         
-        signal_arr = np.array(signal_data)
-        yf = np.abs(fft(signal_arr[-self.window_size:]))
-        xf = fftfreq(self.window_size, 1/self.sampling_rate)
-        
-        mask = (xf >= 0) & (xf <= 50)
-        return xf[mask], yf[mask]
+        signal_arr = np.array(signal_data, dtype=np.float32)
+        np.abs(rfft(signal_arr[-self.window_size:]), out=self._yf_buf)
+        return self._xf_masked, self._yf_buf[:self._fft_cutoff]
     
     def update_plot(self, frame):
         """Update all plots"""
-        # Process queue
-        points_processed = 0
+        # Drain the queue
+        batch = []
         try:
-            while not self.data_queue.empty() and points_processed < 50:
-                data = self.data_queue.get_nowait()
-                self.process_data(data)
-                points_processed += 1
+            while True:
+                batch.append(self.data_queue.get_nowait())
         except queue.Empty:
             pass
+        if batch:
+            self.process_batch(batch)
         
-        artists = []
+        # Limit changes live in the blit background and need a full draw
+        redraw = False
         
         # Update waveform
         if len(self.time_data) > 0:
-            t_data = list(self.time_data)
-            y_data = list(self.signal_data)
+            # Scroll in quarter-window steps
+            last_t = self.time_data[-1]
+            if last_t > self._x_right:
+                self._x_right = float(last_t) + self.display_seconds / 4
+                self.ax_waveform.set_xlim(self._x_right - self.display_seconds, self._x_right)
+                redraw = True
             
-            if t_data[-1] > self.ax_waveform.get_xlim()[1]:
-                 self.ax_waveform.set_xlim(t_data[-1] - self.display_seconds, t_data[-1])
+            t_data = np.fromiter(self.time_data, np.float32)
+            y_data = np.fromiter(self.signal_data, np.float32)
             
             if frame % 10 == 0 and len(y_data) > 0:
-                y_min, y_max = min(y_data), max(y_data)
+                y_min, y_max = float(y_data.min()), float(y_data.max())
                 padding = max(10, (y_max - y_min) * 0.1)
-                self.ax_waveform.set_ylim(y_min - padding, y_max + padding)
+                lo, hi = y_min - padding, y_max + padding
+                cur_lo, cur_hi = self._last_ylim
+                if y_min < cur_lo or y_max > cur_hi or (hi - lo) < 0.8 * (cur_hi - cur_lo):
+                    self.ax_waveform.set_ylim(lo, hi)
+                    self._last_ylim = (lo, hi)
+                    redraw = True
                  
             self.line_waveform.set_data(t_data, y_data)
-            artists.append(self.line_waveform)
         
         # Update FFT
         if frame % 5 == 0 and len(self.signal_data) >= self.window_size:
             xf, yf = self.compute_fft(self.signal_data)
             if xf is not None:
-                self.line_spectrum.set_data(xf, yf)
-                artists.append(self.line_spectrum)
-        else:
-            artists.append(self.line_spectrum)
+                self.line_spectrum.set_ydata(yf)
         
         # Update Alpha band only
-        if len(self.alpha_power_history) > 0:
-            self.bar_alpha[0].set_width(self.current_alpha)
-            self.text_alpha.set_text(f'{self.current_alpha:.2f}')
+        if self._alpha_count > 0:
+            if abs(self.current_alpha - self._bar_widths.get('alpha', -1.0)) > 0.005:
+                self.bar_alpha[0].set_width(self.current_alpha)
+                self._bar_widths['alpha'] = self.current_alpha
+            self._set_text('alpha', self.text_alpha, f'{self.current_alpha:.2f}')
         
         # Update visual impairment prediction
         pred_colors = {'NORMAL': '#00aa00', 'BORDERLINE': '#cc8800', 'IMPAIRED': '#cc0000'}
-        self.health_text.set_text(f'Visual: {self.visual_impairment}')
-        self.health_text.set_color(pred_colors.get(self.visual_impairment, '#333333'))
-        self.health_text.get_bbox_patch().set_edgecolor(pred_colors.get(self.visual_impairment, '#999999'))
+        if self._set_text('health', self.health_text, f'Visual: {self.visual_impairment}',
+                          pred_colors.get(self.visual_impairment, '#333333')):
+            self.health_text.get_bbox_patch().set_edgecolor(pred_colors.get(self.visual_impairment, '#999999'))
+            redraw = True
         
         # Update status
         self.update_status_panel()
-        artists.extend(self.text_elements.values())
         
-        return artists
+        if redraw:
+            self.fig.canvas.draw()
+        return self._animated
     
     def update_status_panel(self):
         """Update status text"""
         cmd_colors = {'FOCUS': '#00aa00', 'RELAX': '#0088cc', 'BLINK': '#cc6600', 'NONE': '#666666'}
         
-        self.text_elements['command'].set_text(f'Command:\n{self.current_command}')
-        self.text_elements['command'].set_color(cmd_colors.get(self.current_command, '#333333'))
+        self._set_text('command', self.text_elements['command'], f'Command:\n{self.current_command}',
+                       cmd_colors.get(self.current_command, '#333333'))
         
         led_text = 'LED: ON' if self.led_state else 'LED: OFF'
-        self.text_elements['led'].set_text(led_text)
-        self.text_elements['led'].set_color('#00aa00' if self.led_state else '#cc0000')
+        self._set_text('led', self.text_elements['led'], led_text,
+                       '#00aa00' if self.led_state else '#cc0000')
         
         # Only Alpha band power - visual focus
         stats_text = f'Alpha Power:\n{self.current_alpha:.2f}'
-        self.text_elements['stats'].set_text(stats_text)
-        self.text_elements['stats'].set_color('#333333')
+        self._set_text('stats', self.text_elements['stats'], stats_text)
     
     def process_data(self, data):
         """Process incoming data - only visual impairment prediction"""
-        self.time_data.append(data['time'])
-        self.signal_data.append(data['amplitude'])
-        
-        if 'command' in data: self.current_command = data['command']
-        if 'alpha_power' in data: 
-            self.current_alpha = data['alpha_power']
-            self.alpha_power_history.append(data['alpha_power'])
-        if 'led_state' in data: self.led_state = data['led_state']
-        # ONLY visual impairment prediction
-        if 'visual_impairment' in data: self.visual_impairment = data['visual_impairment']
+        self.process_batch([data])
+    
+    def process_batch(self, batch):
+        """Append a batch of samples in one call per buffer, then apply each item's state"""
+        self.time_data.extend([d['time'] for d in batch])
+        self.signal_data.extend([d['amplitude'] for d in batch])
+        
+        for data in batch:
+            if 'command' in data: self.current_command = data['command']
+            if 'alpha_power' in data: 
+                self.current_alpha = data['alpha_power']
+                self.alpha_power_history[self._alpha_count % len(self.alpha_power_history)] = data['alpha_power']
+                self._alpha_count += 1
+            if 'led_state' in data: self.led_state = data['led_state']
+            # ONLY visual impairment prediction
+            if 'visual_impairment' in data: self.visual_impairment = data['visual_impairment']
 
 
 # Main entry point
@@ -306,6 +339,8 @@ if __name__ == "__main__":
     try:
         if filepath.endswith('.xlsx') or filepath.endswith('.xls'):
             df = pd.read_excel(filepath)
+        elif filepath.endswith('.parquet'):
+            df = pd.read_parquet(filepath)
         else:  # CSV
             df = pd.read_csv(filepath)
         
@@ -352,7 +387,7 @@ if __name__ == "__main__":
     # Setup animation
     anim = animation.FuncAnimation(vis.fig, vis.update_plot, 
                                   interval=vis.update_interval, 
-                                  blit=False, cache_frame_data=False)
+                                  blit=True, cache_frame_data=False)
     
     print("\n📊 Starting Visual Impairment visualization...")
     print("Watch how Alpha band power relates to visual processing!")
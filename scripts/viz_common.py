@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the BCI visualizers
+"""
+
+import time
+
+# Agg settings for long, dense line paths
+RENDER_PARAMS = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+class VisualizerHelpers:
+    """Mixin for visualizer classes.
+
+    _set_text needs self._last_text = {}; _pace_frames needs self.anim,
+    self.update_interval and self._ema_frame_ms.
+    """
+    _window_hidden = False  # While True, _pace_frames leaves the interval alone
+
+    def _set_text(self, key, artist, text, color=None):
+        """Update a Text artist only if its string or color changed; returns True if it did"""
+        if self._last_text.get(key) == (text, color):
+            return False
+        self._last_text[key] = (text, color)
+        artist.set_text(text)
+        if color is not None:
+            artist.set_color(color)
+        return True
+
+    def _pace_frames(self, start):
+        """Stretch the animation interval while frames take longer than it"""
+        frame_ms = (time.perf_counter() - start) * 1000
+        self._ema_frame_ms = 0.9 * self._ema_frame_ms + 0.1 * frame_ms
+        if self.anim is None or self._window_hidden:
+            return
+        if self._ema_frame_ms > self.update_interval * 1.5:
+            target = int(self._ema_frame_ms * 1.2)
+        else:
+            target = self.update_interval
+        source = self.anim.event_source
+        if abs(source.interval - target) > self.update_interval * 0.2:
+            source.interval = target